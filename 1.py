@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import filedialog, scrolledtext, messagebox, simpledialog
 import language_tool_python
 from textblob import TextBlob
+import spell_backends
 from docx import Document
 import PyPDF2
 import os
@@ -37,6 +38,7 @@ class GrammarSpellChecker:
         self.current_content = ""
         self.matches = []
         self.tool = language_tool_python.LanguageTool('en-US')
+        self.speller = spell_backends.get_backend(default="textblob")
         self.last_export_path = None
 
         self.build_ui()
@@ -128,10 +130,9 @@ class GrammarSpellChecker:
 
         blob = TextBlob(self.current_content)
         words = blob.words
-        for word in words:
-            corrected = str(TextBlob(word).correct())
-            if corrected.lower() != word.lower():
-                self.suggestions_list.insert(tk.END, f"Spelling: {word} → {corrected}")
+        for verdict in self.speller.check_many(words, suggest=True):
+            if verdict.misspelled:
+                self.suggestions_list.insert(tk.END, f"Spelling: {verdict.word} → {verdict.suggestion or '?'}")
                 self.suggestions_list.insert(tk.END, "—" * 50)
 
     def clear_all_tags(self):
@@ -0,0 +1,107 @@
+"""Batch OCR + spell check over many image files.
+
+    python batch_ocr.py scans/ --output results.jsonl --max-distance 20
+    python batch_ocr.py scans/ --output results.hocr
+
+With --max-distance set (e.g. 20), near-duplicate inputs (see dedupe.py) are
+OCR'd once and share their results. Deduplication is off by default. Writes one page per input
+image as JSONL, hOCR or ALTO (see exporters.py, chosen by --format or the output
+extension) and prints how much OCR work deduplication saved.
+"""
+import argparse
+import os
+import sys
+import time
+
+from PIL import Image
+
+import dedupe
+import exporters
+import ocr_config
+import ocr_pipeline
+import spell_backends
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tif")
+
+
+def collect_images(paths):
+    images = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    images.append(os.path.join(path, name))
+        else:
+            images.append(path)
+    return images
+
+
+def check_file(path, speller):
+    with Image.open(path) as img:
+        image = img.convert("RGB")
+    return image.size, ocr_pipeline.check_page(image, speller)
+
+
+def run_batch(paths, speller, max_distance, max_changed_percent, exporter):
+    if max_distance >= 0:
+        clusters = dedupe.cluster(paths, max_distance, max_changed_percent)
+    else:
+        clusters = {i: [i] for i in range(len(paths))}
+
+    # Pages are written in input order. A representative always comes first in
+    # its cluster, so its result is ready before any of its duplicates and can
+    # be dropped once the last of them is written
+    representative_of = {index: rep for rep, members in clusters.items() for index in members}
+    pending = {rep: len(members) for rep, members in clusters.items()}
+    results = {}
+    ocr_seconds = 0.0
+    skipped_seconds = 0.0
+    for index, path in enumerate(paths):
+        rep = representative_of[index]
+        if rep not in results:
+            started = time.perf_counter()
+            results[rep] = check_file(path, speller)
+            elapsed = time.perf_counter() - started
+            ocr_seconds += elapsed
+            skipped_seconds += elapsed * (pending[rep] - 1)
+
+        size, checked = results[rep]
+        exporter.write_page(checked, size, source=path, duplicate_of=paths[rep] if index != rep else None)
+        pending[rep] -= 1
+        if not pending[rep]:
+            del results[rep]
+
+    return len(clusters), ocr_seconds, skipped_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR and spell check a batch of images")
+    parser.add_argument("inputs", nargs="+", help="image files or directories")
+    parser.add_argument("--output", required=True, help="file to write, e.g. results.jsonl")
+    parser.add_argument("--format", choices=list(exporters.EXPORTERS),
+                        help="output format (default: from the output file extension)")
+    parser.add_argument("--max-distance", type=int,
+                        default=ocr_config.get_int("batch", "max_distance", -1),
+                        help="max Hamming distance between the 256-bit dHashes of duplicates; "
+                             "-1 (default) disables deduplication")
+    parser.add_argument("--max-changed-percent", type=float,
+                        default=ocr_config.get_float("batch", "max_changed_percent", 5.0),
+                        help="max percentage of changed ink in any thumbnail tile for a hash match "
+                             "to count as a duplicate")
+    args = parser.parse_args()
+
+    paths = collect_images(args.inputs)
+    speller = spell_backends.get_backend(default="textblob")
+
+    with exporters.open_exporter(args.output, args.format) as exporter:
+        ocr_count, ocr_seconds, skipped_seconds = run_batch(paths, speller, args.max_distance,
+                                                            args.max_changed_percent, exporter)
+
+    print(f"{len(paths)} images, {ocr_count} OCR'd, {len(paths) - ocr_count} reused from duplicates",
+          file=sys.stderr)
+    print(f"OCR time {ocr_seconds:.1f}s, about {skipped_seconds:.1f}s skipped by deduplication",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Perceptual-hash clustering of near-identical images.
+
+Re-scans and repeated photos of the same page hash to within a few bits of
+each other, so OCR only needs to run on one image per cluster.
+
+Text pages with the same layout also hash close together, so a hash match is
+only a candidate. It is confirmed by comparing larger, contrast-normalised
+grayscale thumbnails of the image and its cluster's representative tile by
+tile: in every tile, the pixels that changed are counted against the ink (dark
+pixels) in that tile. A word swapped on an otherwise identical form changes most
+of the ink in its tile, however much unchanged text the rest of the page holds.
+Re-saves, recompression and exposure changes pass that check. Rescaled, blurred,
+shifted or rotated re-scans usually do not; they are OCR'd separately rather
+than risk reusing another page's words.
+
+Each image is only compared with the MAX_REPRESENTATIVES most recently started
+clusters, which bounds memory to about 1 MB per kept thumbnail and keeps the
+scan linear in the number of images. Duplicates further apart than that in
+input order are OCR'd again.
+"""
+from PIL import Image, ImageChops, ImageOps
+
+# 16x16 = 256 hash bits; 8x8 cannot tell apart pages that differ only in their words
+HASH_SIZE = 16
+# Thumbnail used to confirm a hash match, large enough to resolve single letters of
+# small print on an A4 page, and the brightness change (0-255) that counts a
+# thumbnail pixel as different
+CONFIRM_SIZE = (1024, 1024)
+PIXEL_THRESHOLD = 80
+# Pixels darker than INK_LEVEL are ink. Change is measured per TILE_SIZE square
+# of the thumbnail, against at least MIN_INK (mean 0-255, about 3% of the tile)
+# so that marks added to blank areas count in full
+INK_LEVEL = 128
+TILE_SIZE = 32
+MIN_INK = 8
+# Clusters whose representative a new image is still compared with
+MAX_REPRESENTATIVES = 64
+
+
+def fingerprint(path, hash_size=HASH_SIZE):
+    # Returns (dhash, confirmation thumbnail) from a single decode. JPEGs are
+    # decoded at full size: a reduced-size draft decode shifts glyph edges enough
+    # to make a re-saved copy look changed next to its original
+    with Image.open(path) as img:
+        gray = img.convert("L")
+    thumbnail = ImageOps.autocontrast(gray, cutoff=1).resize(CONFIRM_SIZE, Image.Resampling.BOX)
+    return dhash(gray, hash_size), thumbnail
+
+
+def dhash(gray, hash_size=HASH_SIZE):
+    # Difference hash: one bit per horizontally adjacent pixel pair of a tiny
+    # grayscale thumbnail, set when brightness increases left to right
+    pixels = gray.resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR).tobytes()
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] < pixels[offset + col + 1])
+    return bits
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def changed_percent(a, b):
+    # Changed pixels (brightness differs by more than PIXEL_THRESHOLD) as a
+    # percentage of the ink in either thumbnail, in the worst tile. Noise moves
+    # many pixels a little; different words move the glyph pixels a lot
+    changed = ImageChops.difference(a, b).point(lambda v: 255 if v > PIXEL_THRESHOLD else 0)
+    ink = ImageChops.darker(a, b).point(lambda v: 255 if v < INK_LEVEL else 0)
+    # Box-averaging the masks down to one pixel per tile counts both per tile
+    tiles = (-(-a.width // TILE_SIZE), -(-a.height // TILE_SIZE))
+    changed = changed.resize(tiles, Image.Resampling.BOX).tobytes()
+    ink = ink.resize(tiles, Image.Resampling.BOX).tobytes()
+    return max(100.0 * c / max(i, MIN_INK) for c, i in zip(changed, ink))
+
+
+def cluster(paths, max_distance, max_changed_percent, max_representatives=MAX_REPRESENTATIVES):
+    # Greedy clustering in input order: each image joins the first cluster whose
+    # representative is within max_distance hash bits and has at most
+    # max_changed_percent changed ink in any tile, otherwise it starts a new
+    # one. Returns {representative_index: [member_index, ...]} including the
+    # representative.
+    clusters = {}
+    representatives = {}
+    for index, path in enumerate(paths):
+        value, thumbnail = fingerprint(path)
+        for rep, (rep_value, rep_thumbnail) in representatives.items():
+            if (hamming(rep_value, value) <= max_distance
+                    and changed_percent(rep_thumbnail, thumbnail) <= max_changed_percent):
+                clusters[rep].append(index)
+                break
+        else:
+            clusters[index] = [index]
+            representatives[index] = (value, thumbnail)
+            if len(representatives) > max_representatives:
+                # Dicts keep insertion order, so this drops the oldest cluster
+                del representatives[next(iter(representatives))]
+    return clusters
@@ -0,0 +1,221 @@
+"""Structured export of OCR + spelling results as JSONL, hOCR or ALTO XML.
+
+Exporters are written one page at a time: the header goes out when the file is
+opened, each `write_page()` appends and flushes that page, and `close()` writes
+the footer. Only the page being written is held in memory.
+
+    with open_exporter("batch.hocr") as exporter:
+        for path in paths:
+            exporter.write_page(check(path), image_size, source=path)
+
+Words are `ocr_pipeline.CheckedWord`s; their block/paragraph/line numbers give
+the page structure.
+"""
+import json
+import os
+from xml.sax.saxutils import escape, quoteattr
+
+
+def group_lines(words):
+    # {block: {paragraph: {line: [words]}}}, in reading order of first appearance
+    blocks = {}
+    for w in words:
+        blocks.setdefault(w.block_num, {}).setdefault(w.par_num, {}).setdefault(w.line_num, []).append(w)
+    return blocks
+
+
+def hocr_string(value):
+    # hOCR property strings are double-quoted and properties split on ';', so
+    # those characters (and '%' itself) are percent-encoded. urllib.parse.unquote
+    # gives the original back
+    return value.replace("%", "%25").replace('"', "%22").replace(";", "%3B")
+
+
+def bbox(words):
+    return (min(w.left for w in words), min(w.top for w in words),
+            max(w.left + w.width for w in words), max(w.top + w.height for w in words))
+
+
+class Exporter:
+    extensions = ()
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = 0
+        self.file = open(path, "w", encoding="utf-8")
+        self.write_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write_header(self):
+        pass
+
+    def write_footer(self):
+        pass
+
+    def write_page(self, words, image_size, source=None, **extra):
+        self.pages += 1
+        self.write_page_body(words, image_size, source, extra)
+        self.file.flush()
+
+    def write_page_body(self, words, image_size, source, extra):
+        raise NotImplementedError
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.write_footer()
+        self.file.close()
+
+
+class JsonlExporter(Exporter):
+    extensions = (".jsonl",)
+
+    def write_page_body(self, words, image_size, source, extra):
+        record = {
+            "page": self.pages,
+            "source": source,
+            "width": image_size[0],
+            "height": image_size[1],
+            **extra,
+            "text": " ".join(w.text for w in words),
+            "misspelled_count": sum(w.misspelled for w in words),
+            "words": [w._asdict() for w in words],
+        }
+        self.file.write(json.dumps(record) + "\n")
+
+
+class HocrExporter(Exporter):
+    extensions = (".hocr", ".html")
+
+    def write_header(self):
+        self.file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"\n'
+            '    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">\n'
+            '<head>\n'
+            '  <title></title>\n'
+            '  <meta http-equiv="Content-Type" content="text/html; charset=utf-8" />\n'
+            '  <meta name="ocr-system" content="tesseract" />\n'
+            '  <meta name="ocr-capabilities" content="ocr_page ocr_carea ocr_par ocr_line ocrx_word" />\n'
+            '</head>\n'
+            '<body>\n'
+        )
+
+    def write_footer(self):
+        self.file.write('</body>\n</html>\n')
+
+    def write_page_body(self, words, image_size, source, extra):
+        p = self.pages
+        title = f"bbox 0 0 {image_size[0]} {image_size[1]}; ppageno {p - 1}"
+        if source:
+            title = f'image "{hocr_string(source)}"; ' + title
+        out = [f'  <div class="ocr_page" id="page_{p}" title={quoteattr(title)}>\n']
+        word_id = 0
+        for b, paragraphs in group_lines(words).items():
+            block_words = [w for lines in paragraphs.values() for line in lines.values() for w in line]
+            out.append(f'   <div class="ocr_carea" id="block_{p}_{b}" title="bbox %d %d %d %d">\n' % bbox(block_words))
+            for n, lines in paragraphs.items():
+                par_words = [w for line in lines.values() for w in line]
+                out.append(f'    <p class="ocr_par" id="par_{p}_{b}_{n}" title="bbox %d %d %d %d">\n' % bbox(par_words))
+                for ln, line in lines.items():
+                    out.append(f'     <span class="ocr_line" id="line_{p}_{b}_{n}_{ln}" '
+                               f'title="bbox %d %d %d %d">' % bbox(line))
+                    for w in line:
+                        word_id += 1
+                        attrs = (f'class="ocrx_word" id="word_{p}_{word_id}" title="bbox {w.left} {w.top} '
+                                 f'{w.left + w.width} {w.top + w.height}; x_wconf {round(w.conf)}"')
+                        if w.misspelled:
+                            attrs += ' data-misspelled="true"'
+                            if w.suggestion:
+                                attrs += f' data-suggestion={quoteattr(w.suggestion)}'
+                        out.append(f'<span {attrs}>{escape(w.text)}</span> ')
+                    out.append('</span>\n')
+                out.append('    </p>\n')
+            out.append('   </div>\n')
+        out.append('  </div>\n')
+        self.file.write("".join(out))
+
+
+class AltoExporter(Exporter):
+    extensions = (".xml", ".alto")
+
+    def write_header(self):
+        self.file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<alto xmlns="http://www.loc.gov/standards/alto/ns-v4#"\n'
+            '      xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"\n'
+            '      xsi:schemaLocation="http://www.loc.gov/standards/alto/ns-v4# '
+            'http://www.loc.gov/alto/v4/alto-4-2.xsd">\n'
+            '  <Description>\n'
+            '    <MeasurementUnit>pixel</MeasurementUnit>\n'
+            '  </Description>\n'
+            '  <Tags>\n'
+            '    <OtherTag ID="MISSPELLED" LABEL="misspelled" DESCRIPTION="Flagged by the spell checker"/>\n'
+            '  </Tags>\n'
+            '  <Layout>\n'
+        )
+
+    def write_footer(self):
+        self.file.write('  </Layout>\n</alto>\n')
+
+    @staticmethod
+    def _box(box):
+        left, top, right, bottom = box
+        return f'HPOS="{left}" VPOS="{top}" WIDTH="{right - left}" HEIGHT="{bottom - top}"'
+
+    def write_page_body(self, words, image_size, source, extra):
+        p = self.pages
+        # ALTO pages carry no file name, so the source is only recorded in JSONL and hOCR
+        attrs = f'ID="page_{p}" PHYSICAL_IMG_NR="{p}" WIDTH="{image_size[0]}" HEIGHT="{image_size[1]}"'
+        out = [f'    <Page {attrs}>\n',
+               f'      <PrintSpace HPOS="0" VPOS="0" WIDTH="{image_size[0]}" HEIGHT="{image_size[1]}">\n']
+        for b, paragraphs in group_lines(words).items():
+            for n, lines in paragraphs.items():
+                # ALTO has no paragraph level; each tesseract paragraph becomes a TextBlock
+                par_words = [w for line in lines.values() for w in line]
+                out.append(f'        <TextBlock ID="block_{p}_{b}_{n}" {self._box(bbox(par_words))}>\n')
+                for ln, line in lines.items():
+                    out.append(f'          <TextLine ID="line_{p}_{b}_{n}_{ln}" {self._box(bbox(line))}>\n')
+                    for i, w in enumerate(line):
+                        if i:
+                            out.append('            <SP/>\n')
+                        box = (w.left, w.top, w.left + w.width, w.top + w.height)
+                        wc = max(0.0, min(1.0, w.conf / 100))
+                        string = f'<String CONTENT={quoteattr(w.text)} {self._box(box)} WC="{wc:.2f}"'
+                        if not w.misspelled:
+                            out.append(f'            {string}/>\n')
+                            continue
+                        string += ' TAGREFS="MISSPELLED"'
+                        if w.suggestion:
+                            out.append(f'            {string}>'
+                                       f'<ALTERNATIVE>{escape(w.suggestion)}</ALTERNATIVE></String>\n')
+                        else:
+                            out.append(f'            {string}/>\n')
+                    out.append('          </TextLine>\n')
+                out.append('        </TextBlock>\n')
+        out.append('      </PrintSpace>\n    </Page>\n')
+        self.file.write("".join(out))
+
+
+EXPORTERS = {"jsonl": JsonlExporter, "hocr": HocrExporter, "alto": AltoExporter}
+
+
+def format_for_path(path):
+    ext = os.path.splitext(path)[1].lower()
+    for name, exporter in EXPORTERS.items():
+        if ext in exporter.extensions:
+            return name
+    return None
+
+
+def open_exporter(path, fmt=None):
+    fmt = fmt or format_for_path(path)
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown export format for {path}, expected one of: {', '.join(EXPORTERS)}")
+    return EXPORTERS[fmt](path)
@@ -0,0 +1,272 @@
+"""Durable OCR job queue in a single sqlite file, for long multi-machine runs.
+
+    python job_queue.py add jobs.db scans/            # enqueue images
+    python job_queue.py work jobs.db                  # run a worker (start as many as you like)
+    python job_queue.py status jobs.db                # progress, throughput and ETA
+    python job_queue.py export jobs.db results.hocr   # write finished results
+
+Workers lease one job at a time. A worker heartbeats while it processes, which
+keeps extending the lease. If the worker dies, the lease expires and another
+worker picks the job up again. A job is retried until it has been attempted
+max_attempts times, after which it is marked failed. Every finished job's
+result is stored in the database as soon as it completes, so a crash loses at
+most the jobs that were in flight.
+
+To spread work over several machines, put the database on a filesystem they
+all mount with working file locks. No broker is needed. Defaults come from the
+[queue] section of ocr_config.ini.
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+import batch_ocr
+import exporters
+import ocr_config
+import ocr_pipeline
+import spell_backends
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    started REAL,
+    finished REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+"""
+
+STATUSES = ("pending", "leased", "done", "failed")
+
+
+def connect(db_path):
+    # isolation_level=None: transactions are explicit, so leasing can take the
+    # write lock up front with BEGIN IMMEDIATE
+    conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class JobQueue:
+    def __init__(self, db_path, lease_seconds=None, max_attempts=None):
+        self.db_path = db_path
+        self.lease_seconds = (ocr_config.get_float("queue", "lease_seconds", 120)
+                              if lease_seconds is None else lease_seconds)
+        self.max_attempts = (ocr_config.get_int("queue", "max_attempts", 3)
+                             if max_attempts is None else max_attempts)
+        self.conn = connect(db_path)
+
+    def add(self, paths):
+        before = self.conn.total_changes
+        self.conn.execute("BEGIN")
+        self.conn.executemany("INSERT OR IGNORE INTO jobs (path) VALUES (?)",
+                              ((os.path.abspath(p),) for p in paths))
+        self.conn.execute("COMMIT")
+        return self.conn.total_changes - before
+
+    def lease(self, worker):
+        # Returns (job_id, path) or None. Expired leases are fair game again, except
+        # for jobs that have already used up their attempts
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'lease expired', worker = NULL "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts))
+            row = self.conn.execute(
+                "SELECT id, path FROM jobs "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT 1", (now,)).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, started = ? WHERE id = ?",
+                    (worker, now + self.lease_seconds, now, row[0]))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def heartbeat(self, job_id, worker, conn=None):
+        # False once the lease has been lost to another worker
+        cur = (conn or self.conn).execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, job_id, worker))
+        return cur.rowcount == 1
+
+    def complete(self, job_id, worker, result):
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, error = NULL, finished = ?, lease_expires = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (json.dumps(result), time.time(), job_id, worker))
+        return cur.rowcount == 1
+
+    def fail(self, job_id, worker, error):
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, worker = NULL, lease_expires = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (self.max_attempts, error, job_id, worker))
+
+    def has_open_jobs(self):
+        row = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')").fetchone()
+        return row[0] > 0
+
+    def counts(self):
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+        return counts
+
+    def throughput(self, window_seconds):
+        # Jobs per second over the recent window, which is cut short when the run
+        # itself is younger than the window
+        now = time.time()
+        first = self.conn.execute("SELECT MIN(started) FROM jobs WHERE status = 'done'").fetchone()[0]
+        if first is None:
+            return 0.0
+        window = min(window_seconds, now - first)
+        recent = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'done' AND finished >= ?",
+                                   (now - window,)).fetchone()[0]
+        return recent / window if window > 0 else 0.0
+
+    def active_workers(self):
+        rows = self.conn.execute("SELECT DISTINCT worker FROM jobs WHERE status = 'leased' AND lease_expires >= ?",
+                                 (time.time(),))
+        return [row[0] for row in rows]
+
+    def results(self):
+        return self.conn.execute("SELECT path, result FROM jobs WHERE status = 'done' ORDER BY id")
+
+
+def _heartbeat_loop(queue, job_id, worker, interval, stop):
+    # sqlite connections are per thread
+    conn = connect(queue.db_path)
+    try:
+        while not stop.wait(interval):
+            if not queue.heartbeat(job_id, worker, conn):
+                break
+    finally:
+        conn.close()
+
+
+def work(queue, worker, heartbeat_seconds, poll_seconds):
+    speller = spell_backends.get_backend(default="textblob")
+    processed = 0
+    while True:
+        job = queue.lease(worker)
+        if job is None:
+            # Leased jobs may still come back if their worker dies, so only
+            # stop once nothing is pending or in flight
+            if not queue.has_open_jobs():
+                return processed
+            time.sleep(poll_seconds)
+            continue
+
+        job_id, path = job
+        stop = threading.Event()
+        beater = threading.Thread(target=_heartbeat_loop, args=(queue, job_id, worker, heartbeat_seconds, stop),
+                                  daemon=True)
+        beater.start()
+        try:
+            size, checked = batch_ocr.check_file(path, speller)
+        except Exception as e:
+            queue.fail(job_id, worker, f"{type(e).__name__}: {e}")
+            print(f"[{worker}] failed {path}: {e}")
+            continue
+        finally:
+            stop.set()
+            beater.join()
+
+        result = {"width": size[0], "height": size[1], "words": [w._asdict() for w in checked]}
+        if queue.complete(job_id, worker, result):
+            processed += 1
+            print(f"[{worker}] done {path}")
+        else:
+            print(f"[{worker}] lease on {path} was lost, result discarded")
+
+
+def print_status(queue, window_seconds):
+    counts = queue.counts()
+    total = sum(counts.values())
+    remaining = counts["pending"] + counts["leased"]
+    rate = queue.throughput(window_seconds)
+
+    print(f"Jobs: {total} total, " + ", ".join(f"{counts[s]} {s}" for s in STATUSES))
+    workers = queue.active_workers()
+    print(f"Active workers: {len(workers)}" + (f" ({', '.join(workers)})" if workers else ""))
+    if rate:
+        eta = remaining / rate
+        print(f"Throughput: {rate * 60:.1f} jobs/min, ETA {int(eta // 3600)}h {int(eta % 3600 // 60)}m")
+    else:
+        print("Throughput: no finished jobs yet")
+
+
+def export(queue, output, fmt=None):
+    count = 0
+    with exporters.open_exporter(output, fmt) as exporter:
+        for path, result in queue.results():
+            page = json.loads(result)
+            words = [ocr_pipeline.CheckedWord(**w) for w in page["words"]]
+            exporter.write_page(words, (page["width"], page["height"]), source=path)
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Durable OCR job queue")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add_cmd = sub.add_parser("add", help="enqueue image files or directories")
+    add_cmd.add_argument("db")
+    add_cmd.add_argument("inputs", nargs="+")
+
+    work_cmd = sub.add_parser("work", help="process jobs until the queue is drained")
+    work_cmd.add_argument("db")
+    work_cmd.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    work_cmd.add_argument("--lease", type=float, help="lease length in seconds")
+    work_cmd.add_argument("--heartbeat", type=float,
+                          default=ocr_config.get_float("queue", "heartbeat_seconds", 30),
+                          help="seconds between lease renewals")
+    work_cmd.add_argument("--max-attempts", type=int)
+    work_cmd.add_argument("--poll", type=float, default=5.0, help="seconds to wait when no job is free")
+
+    status_cmd = sub.add_parser("status", help="show progress, throughput and ETA")
+    status_cmd.add_argument("db")
+    status_cmd.add_argument("--window", type=float, default=600, help="throughput window in seconds")
+
+    export_cmd = sub.add_parser("export", help="write finished results as JSONL, hOCR or ALTO")
+    export_cmd.add_argument("db")
+    export_cmd.add_argument("output")
+    export_cmd.add_argument("--format", choices=list(exporters.EXPORTERS))
+
+    args = parser.parse_args()
+
+    if args.command == "add":
+        queue = JobQueue(args.db)
+        added = queue.add(batch_ocr.collect_images(args.inputs))
+        print(f"Added {added} jobs")
+    elif args.command == "work":
+        queue = JobQueue(args.db, lease_seconds=args.lease, max_attempts=args.max_attempts)
+        processed = work(queue, args.worker_id, args.heartbeat, args.poll)
+        print(f"[{args.worker_id}] queue drained, processed {processed} jobs")
+    elif args.command == "status":
+        print_status(JobQueue(args.db), args.window)
+    elif args.command == "export":
+        count = export(JobQueue(args.db), args.output, args.format)
+        print(f"Exported {count} pages to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Incremental OCR + spell check over a live camera or a recorded video.
+
+    python live_ocr.py recording.mp4 --fps 2 --output frames.jsonl
+    python live_ocr.py 0                       # first camera
+
+Frames are sampled at the target rate. Each sampled frame is compared with the
+last processed one on a coarse grid of tiles. Unchanged frames are skipped
+and, when only part of the view changed, only that region is OCR'd and merged
+with the words still visible elsewhere. Spelling verdicts are cached across
+frames, so a token is checked only the first time it is seen.
+"""
+import argparse
+import json
+import sys
+import time
+
+import cv2
+from PIL import Image, ImageChops
+
+import ocr_config
+import ocr_pipeline
+import spell_backends
+
+# Width of the grayscale thumbnail used for change detection, and the size of a
+# change-detection tile in thumbnail pixels
+DIFF_WIDTH = 160
+TILE_SIZE = 8
+# Padding in full-resolution pixels around the changed region before OCR
+REGION_PADDING = 16
+
+
+def reading_order(words):
+    # Groups words into lines by vertical overlap, then reads each line left to
+    # right. Sorting on (top, left) alone would split a line wherever word tops
+    # differ by a pixel, e.g. a capitalised word next to lowercase ones
+    lines = []
+    bottom = None
+    for w in sorted(words, key=lambda w: w.top):
+        if lines and w.top + w.height / 2 < bottom:
+            lines[-1].append(w)
+            bottom = max(bottom, w.top + w.height)
+        else:
+            lines.append([w])
+            bottom = w.top + w.height
+    return [w for line in lines for w in sorted(line, key=lambda w: w.left)]
+
+
+class LiveOCR:
+    def __init__(self, speller, change_threshold=12, full_frame_ratio=0.6):
+        self.speller = spell_backends.CachedBackend(speller)
+        self.change_threshold = change_threshold
+        self.full_frame_ratio = full_frame_ratio
+        self.previous = None
+        self.words = []
+        self.stats = {"frames": 0, "unchanged": 0, "partial": 0, "full": 0}
+
+    def _thumbnail(self, frame):
+        height = max(TILE_SIZE, round(frame.height * DIFF_WIDTH / frame.width))
+        return frame.convert("L").resize((DIFF_WIDTH, height), Image.Resampling.BILINEAR)
+
+    def changed_region(self, thumbnail, frame_size):
+        # Averaging the difference image down to one pixel per tile gives the
+        # mean change of every tile in a single resize
+        diff = ImageChops.difference(thumbnail, self.previous)
+        cols = -(-thumbnail.width // TILE_SIZE)
+        rows = -(-thumbnail.height // TILE_SIZE)
+        tiles = diff.resize((cols, rows), Image.Resampling.BOX).tobytes()
+
+        changed = [(i % cols, i // cols) for i, value in enumerate(tiles) if value > self.change_threshold]
+        if not changed:
+            return None, 0.0
+
+        scale_x = frame_size[0] / cols
+        scale_y = frame_size[1] / rows
+        left = min(c for c, _ in changed) * scale_x - REGION_PADDING
+        top = min(r for _, r in changed) * scale_y - REGION_PADDING
+        right = (max(c for c, _ in changed) + 1) * scale_x + REGION_PADDING
+        bottom = (max(r for _, r in changed) + 1) * scale_y + REGION_PADDING
+        box = (max(0, int(left)), max(0, int(top)), min(frame_size[0], int(right)), min(frame_size[1], int(bottom)))
+        return box, len(changed) / (cols * rows)
+
+    def process(self, frame):
+        # Returns the current words and whether this frame triggered any OCR
+        self.stats["frames"] += 1
+        thumbnail = self._thumbnail(frame)
+
+        if self.previous is None or self.previous.size != thumbnail.size:
+            box, ratio = (0, 0, frame.width, frame.height), 1.0
+        else:
+            box, ratio = self.changed_region(thumbnail, frame.size)
+            if box is None:
+                self.stats["unchanged"] += 1
+                return self.words, False
+
+        if ratio >= self.full_frame_ratio:
+            self.stats["full"] += 1
+            self.words = ocr_pipeline.check_page(frame, self.speller)
+        else:
+            self.stats["partial"] += 1
+            left, top, right, bottom = box
+            region = ocr_pipeline.check_page(frame.crop(box), self.speller)
+            kept = [w for w in self.words
+                    if w.left + w.width <= left or w.left >= right or w.top + w.height <= top or w.top >= bottom]
+            fresh = [w._replace(left=w.left + left, top=w.top + top) for w in region]
+            self.words = reading_order(kept + fresh)
+
+        self.previous = thumbnail
+        return self.words, True
+
+
+def frames(source, target_fps):
+    # Yields (timestamp_seconds, PIL frame) at no more than target_fps. Video files
+    # are sampled by their own timestamps; cameras by wall clock, dropping the
+    # frames that arrived while the previous one was being processed
+    capture = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    if not capture.isOpened():
+        raise OSError(f"Could not open video source: {source}")
+    is_camera = source.isdigit()
+    interval = 1.0 / target_fps
+    started = time.monotonic()
+    next_due = 0.0
+    try:
+        while True:
+            if not capture.grab():
+                break
+            if is_camera:
+                timestamp = time.monotonic() - started
+            else:
+                timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if timestamp < next_due:
+                continue
+            ok, frame = capture.retrieve()
+            if not ok:
+                break
+            next_due = max(next_due + interval, timestamp)
+            yield timestamp, Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    finally:
+        capture.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live OCR spell check from a camera or video file")
+    parser.add_argument("source", help="camera index (e.g. 0) or video file path")
+    parser.add_argument("--fps", type=float, default=ocr_config.get_float("live", "fps", 2.0),
+                        help="target number of frames considered per second")
+    parser.add_argument("--change-threshold", type=int,
+                        default=ocr_config.get_int("live", "change_threshold", 12),
+                        help="mean per-tile brightness change (0-255) that counts as changed")
+    parser.add_argument("--output", help="JSONL file for per-frame results (default: stdout)")
+    args = parser.parse_args()
+
+    live = LiveOCR(spell_backends.get_backend(default="textblob"), change_threshold=args.change_threshold)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    started = time.monotonic()
+    try:
+        for timestamp, frame in frames(args.source, args.fps):
+            words, updated = live.process(frame)
+            if updated:
+                record = {
+                    "time": round(timestamp, 3),
+                    "text": " ".join(w.text for w in words),
+                    "misspelled": [w.text for w in words if w.misspelled],
+                }
+                out.write(json.dumps(record) + "\n")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.output:
+            out.close()
+
+    elapsed = time.monotonic() - started
+    stats = live.stats
+    print(f"{stats['frames']} frames in {elapsed:.1f}s ({stats['frames'] / max(elapsed, 1e-9):.1f} fps): "
+          f"{stats['unchanged']} unchanged, {stats['partial']} partial OCR, {stats['full']} full OCR",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Load test for ocr_service.py.
+
+    python loadtest.py sample.png --url http://127.0.0.1:8080/ocr --clients 16 --requests 200
+
+Each client posts the image in a loop until the total number of requests is
+reached, then p50/p99 latency and throughput are printed. 429 responses are
+counted separately and left out of the latency figures, as are connection
+errors and timeouts, which are counted under their exception name.
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def client(session, url, data, remaining, latencies, statuses):
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        started = time.perf_counter()
+        try:
+            async with session.post(url, data=data, headers={"Content-Type": "application/octet-stream"}) as resp:
+                await resp.read()
+                status = resp.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # An overloaded server dropping connections is a result, not a reason to stop
+            status = type(e).__name__
+        statuses[status] = statuses.get(status, 0) + 1
+        if status == 200:
+            latencies.append(time.perf_counter() - started)
+
+
+async def run(url, data, clients, total, timeout):
+    remaining = [total]
+    latencies = []
+    statuses = {}
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        await asyncio.gather(*(client(session, url, data, remaining, latencies, statuses)
+                               for _ in range(clients)))
+    return time.perf_counter() - started, sorted(latencies), statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the OCR HTTP service")
+    parser.add_argument("image", help="image file to upload")
+    parser.add_argument("--url", default="http://127.0.0.1:8080/ocr")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=100, help="total requests")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds before a request counts as failed")
+    args = parser.parse_args()
+
+    with open(args.image, "rb") as f:
+        data = f.read()
+
+    elapsed, latencies, statuses = asyncio.run(run(args.url, data, args.clients, args.requests, args.timeout))
+
+    print(f"{args.requests} requests, {args.clients} clients, {elapsed:.2f}s")
+    # Keys mix HTTP status codes and exception names
+    counts = sorted(statuses.items(), key=lambda item: str(item[0]))
+    print("Status codes: " + ", ".join(f"{code}: {count}" for code, count in counts))
+    if latencies:
+        print(f"Throughput: {len(latencies) / elapsed:.2f} req/s")
+        print(f"Latency p50: {percentile(latencies, 50) * 1000:.0f} ms")
+        print(f"Latency p99: {percentile(latencies, 99) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
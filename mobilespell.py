@@ -6,13 +6,21 @@ from kivy.uix.label import Label
 from kivy.uix.scrollview import ScrollView
 from kivy.graphics import Rectangle, Color
 from kivy.clock import Clock
+from kivy.graphics.texture import Texture
 from kivy.utils import platform
 from kivy.lang import Builder
 
 from PIL import Image as PILImage, ImageDraw
 import pytesseract
-from textblob import TextBlob
 import os
+import threading
+import ocr_pipeline
+import spell_backends
+
+# Longest side (in pixels) an image is scaled down to before OCR. Phone cameras
+# produce 12MP+ photos; tesseract gains little from that resolution on a
+# mid-range CPU but pays for it in seconds and memory.
+MAX_OCR_SIDE = 1600 if platform == 'android' else 2400
 
 # Kivy GUI Layout (KV Language)
 Builder.load_string('''
@@ -43,6 +51,7 @@ Builder.load_string('''
             height: self.texture_size[1]
             text_size: (self.width, None)
             padding: (10, 10)
+            markup: True
 ''')
 
 
@@ -51,6 +60,8 @@ class OCRSpellCheckAppMobile(BoxLayout):
         super().__init__(**kwargs)
         self.original_image = None
         self.image_path = ""
+        self.processing = False
+        self.speller = spell_backends.get_backend(default="textblob")
 
         # Set Tesseract path for Android
         if platform == 'android':
@@ -90,24 +101,30 @@ class OCRSpellCheckAppMobile(BoxLayout):
         self.ids.img_preview.source = path
         self.ids.img_preview.reload()
 
-    def is_misspelled(self, word):
-        if word.isdigit() or len(word) < 2:
-            return False
-        tb = TextBlob(word)
-        corrected = tb.correct()
-        return str(corrected).lower() != word.lower()
-
     def process_image(self):
         if not self.image_path:
             self.ids.extracted_text.text = "Please load an image first!"
             return
+        if self.processing:
+            return
 
+        # Run OCR and spell checking off the UI thread so the app stays responsive
+        self.processing = True
+        self.ids.extracted_text.text = "Processing..."
+        worker = threading.Thread(target=self._process_worker, args=(self.image_path,), daemon=True)
+        worker.start()
+
+    def _process_worker(self, image_path):
         try:
-            img = PILImage.open(self.image_path)
+            img = PILImage.open(image_path)
+            # Let the JPEG decoder skip resolution we are going to throw away anyway
+            img.draft('RGB', (MAX_OCR_SIDE, MAX_OCR_SIDE))
+            img = img.convert('RGB')
+            img.thumbnail((MAX_OCR_SIDE, MAX_OCR_SIDE), PILImage.Resampling.LANCZOS)
             draw = ImageDraw.Draw(img)
 
-            # OCR processing
-            ocr_data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+            # OCR processing (full or adaptive, see ocr_pipeline)
+            ocr_data = ocr_pipeline.image_to_data(img)
 
             # Extract words and positions
             words = ocr_data['text']
@@ -118,31 +135,46 @@ class OCRSpellCheckAppMobile(BoxLayout):
             heights = ocr_data['height']
 
             # Process words
-            result_text = ""
+            result_parts = []
             misspelled_count = 0
 
-            for i, word in enumerate(words):
-                if word.strip() and confidences[i] > 60:
-                    if self.is_misspelled(word):
-                        # Highlight misspelled words
-                        x, y, w, h = lefts[i], tops[i], widths[i], heights[i]
-                        draw.rectangle([x, y, x + w, y + h], outline="red", width=2)
-                        result_text += f"[color=ff0000]{word}[/color] "
-                        misspelled_count += 1
-                    else:
-                        result_text += word + " "
-
-            # Save and display processed image
-            processed_path = os.path.join(os.path.dirname(self.image_path), "processed.jpg")
-            img.save(processed_path)
-            self.display_image(processed_path)
-
-            # Show results
-            self.ids.extracted_text.text = result_text
-            self.ids.extracted_text.text += f"\n\nFound {misspelled_count} misspelled words"
-
+            valid_indices = [i for i, word in enumerate(words)
+                             if word.strip() and float(confidences[i]) > 60]
+            verdicts = self.speller.check_many([words[i] for i in valid_indices])
+
+            for i, verdict in zip(valid_indices, verdicts):
+                word = words[i]
+                if verdict.misspelled:
+                    # Highlight misspelled words
+                    x, y, w, h = lefts[i], tops[i], widths[i], heights[i]
+                    draw.rectangle([x, y, x + w, y + h], outline="red", width=2)
+                    result_parts.append(f"[color=ff0000]{word}[/color]")
+                    misspelled_count += 1
+                else:
+                    result_parts.append(word)
+
+            result_text = " ".join(result_parts)
+            result_text += f"\n\nFound {misspelled_count} misspelled words"
+            pixels = img.tobytes()
         except Exception as e:
-            self.ids.extracted_text.text = f"Error: {str(e)}"
+            error_text = f"Error: {str(e)}"
+            Clock.schedule_once(lambda dt: self.show_result(error_text))
+            return
+
+        Clock.schedule_once(lambda dt: self.show_result(result_text, img, pixels))
+
+    def show_result(self, text, image=None, pixels=None):
+        # Called on the UI thread; textures may only be created here
+        if image is not None:
+            self.original_image = image
+            texture = Texture.create(size=image.size, colorfmt='rgb')
+            texture.blit_buffer(pixels, colorfmt='rgb', bufferfmt='ubyte')
+            # PIL rows run top to bottom, OpenGL textures bottom to top
+            texture.flip_vertical()
+            self.ids.img_preview.texture = texture
+
+        self.ids.extracted_text.text = text
+        self.processing = False
 
 
 class MobileOCRApp(App):
@@ -0,0 +1,34 @@
+"""Deployment settings shared by the OCR front-ends.
+
+Values are read from ocr_config.ini next to this file (or the file named by
+$OCR_CONFIG) and can be overridden per process with environment variables
+named OCR_<SECTION>_<KEY>, e.g. OCR_SPELLING_BACKEND=compact.
+
+    [spelling]
+    backend = compact
+    dictionary = /opt/ocr/spelling.dict
+"""
+import configparser
+import os
+
+CONFIG_PATH = os.environ.get(
+    "OCR_CONFIG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ocr_config.ini")
+)
+
+_parser = configparser.ConfigParser()
+_parser.read(CONFIG_PATH, encoding="utf-8")
+
+
+def get(section, key, fallback=None):
+    env_name = f"OCR_{section}_{key}".upper()
+    if env_name in os.environ:
+        return os.environ[env_name]
+    return _parser.get(section, key, fallback=fallback)
+
+
+def get_int(section, key, fallback):
+    return int(get(section, key, fallback))
+
+
+def get_float(section, key, fallback):
+    return float(get(section, key, fallback))
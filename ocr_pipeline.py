@@ -0,0 +1,161 @@
+"""OCR helpers shared by the front-ends.
+
+`image_to_data(image)` is a drop-in for
+`pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)` that
+honours the [ocr] section of ocr_config.ini:
+
+    [ocr]
+    mode = adaptive        ; "full" (default) or "adaptive"
+    min_conf = 60          ; words at or below this are "weak"
+    fast_scale = 0.5       ; adaptive: resolution of the first pass
+    refine_psm = 7         ; adaptive: page segmentation mode for re-OCR of a line
+    time_budget = 2.0      ; adaptive: seconds to spend re-OCRing, 0 = no limit
+
+In adaptive mode the whole page is read once at reduced resolution, then only
+the lines containing weak words are cropped from the full-resolution image and
+read again. A refined line replaces the first-pass words when its mean
+confidence is higher. Lines are refined worst first so a tight time budget is
+spent where it helps most.
+"""
+import time
+from collections import namedtuple
+
+import pytesseract
+from PIL import Image, ImageDraw
+
+import ocr_config
+
+Word = namedtuple("Word", ["text", "conf", "left", "top", "width", "height",
+                           "block_num", "par_num", "line_num", "word_num"])
+
+DATA_KEYS = Word._fields
+
+# A recognised word plus its spelling verdict
+CheckedWord = namedtuple("CheckedWord", Word._fields + ("misspelled", "suggestion"))
+
+# Padding (in full-resolution pixels) around a weak line before re-OCR, so
+# tesseract sees the whole glyphs and some background
+LINE_PADDING = 6
+
+
+def parse_conf(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return -1.0
+
+
+def ocr_words(image, config=""):
+    data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+    words = []
+    for i, text in enumerate(data['text']):
+        if not text.strip():
+            continue
+        words.append(Word(text, parse_conf(data['conf'][i]),
+                          data['left'][i], data['top'][i], data['width'][i], data['height'][i],
+                          data['block_num'][i], data['par_num'][i], data['line_num'][i], data['word_num'][i]))
+    return words
+
+
+def words_to_data(words):
+    data = {key: [] for key in DATA_KEYS}
+    for word in words:
+        for key, value in zip(DATA_KEYS, word):
+            data[key].append(value)
+    return data
+
+
+def _scale_word(word, factor):
+    return word._replace(left=round(word.left * factor), top=round(word.top * factor),
+                         width=round(word.width * factor), height=round(word.height * factor))
+
+
+def _mean_conf(words):
+    return sum(w.conf for w in words) / len(words) if words else -1.0
+
+
+def adaptive_ocr(image, min_conf=None, fast_scale=None, refine_psm=None, time_budget=None):
+    min_conf = ocr_config.get_float("ocr", "min_conf", 60) if min_conf is None else min_conf
+    fast_scale = ocr_config.get_float("ocr", "fast_scale", 0.5) if fast_scale is None else fast_scale
+    refine_psm = ocr_config.get_int("ocr", "refine_psm", 7) if refine_psm is None else refine_psm
+    time_budget = ocr_config.get_float("ocr", "time_budget", 0) if time_budget is None else time_budget
+
+    # Fast first pass at reduced resolution, boxes mapped back to full resolution
+    if fast_scale < 1:
+        small_size = (max(1, round(image.width * fast_scale)), max(1, round(image.height * fast_scale)))
+        small = image.resize(small_size, Image.Resampling.BILINEAR)
+        words = [_scale_word(w, 1 / fast_scale) for w in ocr_words(small)]
+    else:
+        words = ocr_words(image)
+
+    # Group words into lines and collect the lines holding at least one weak word
+    lines = {}
+    for index, word in enumerate(words):
+        lines.setdefault((word.block_num, word.par_num, word.line_num), []).append(index)
+    weak_lines = [indices for indices in lines.values()
+                  if any(words[i].conf <= min_conf for i in indices)]
+    weak_lines.sort(key=lambda indices: _mean_conf([words[i] for i in indices]))
+
+    # The budget covers re-OCR only; the first pass always runs to completion
+    started = time.monotonic()
+    replacements = {}
+    for indices in weak_lines:
+        if time_budget and time.monotonic() - started >= time_budget:
+            break
+        line_words = [words[i] for i in indices]
+        left = max(0, min(w.left for w in line_words) - LINE_PADDING)
+        top = max(0, min(w.top for w in line_words) - LINE_PADDING)
+        right = min(image.width, max(w.left + w.width for w in line_words) + LINE_PADDING)
+        bottom = min(image.height, max(w.top + w.height for w in line_words) + LINE_PADDING)
+        if right <= left or bottom <= top:
+            continue
+
+        refined = ocr_words(image.crop((left, top, right, bottom)), config=f"--psm {refine_psm}")
+        if not refined or _mean_conf(refined) <= _mean_conf(line_words):
+            continue
+
+        # Keep the first pass's layout ids so the line stays where it was on the page
+        first = line_words[0]
+        replacements[indices[0]] = [
+            w._replace(left=w.left + left, top=w.top + top, block_num=first.block_num,
+                       par_num=first.par_num, line_num=first.line_num, word_num=n + 1)
+            for n, w in enumerate(refined)
+        ]
+        for i in indices[1:]:
+            replacements[i] = []
+
+    merged = []
+    for index, word in enumerate(words):
+        merged.extend(replacements.get(index, [word]))
+    return merged
+
+
+def recognize(image, mode=None):
+    mode = mode or ocr_config.get("ocr", "mode", "full")
+    if mode == "adaptive":
+        return adaptive_ocr(image)
+    if mode != "full":
+        raise ValueError(f"Unknown OCR mode '{mode}', expected 'full' or 'adaptive'")
+    return ocr_words(image)
+
+
+def image_to_data(image, mode=None):
+    return words_to_data(recognize(image, mode))
+
+
+def check_page(image, speller, min_conf=None, mode=None, suggest=False):
+    # OCR one page and spell check every word above min_conf, like the front-ends do
+    min_conf = ocr_config.get_float("ocr", "min_conf", 60) if min_conf is None else min_conf
+    words = [w for w in recognize(image, mode) if w.conf > min_conf]
+    verdicts = speller.check_many([w.text for w in words], suggest)
+    return [CheckedWord(*word, verdict.misspelled, verdict.suggestion)
+            for word, verdict in zip(words, verdicts)]
+
+
+def annotate(image, checked_words):
+    # Outline misspelled words in red, in place
+    draw = ImageDraw.Draw(image)
+    for w in checked_words:
+        if w.misspelled:
+            draw.rectangle([w.left, w.top, w.left + w.width, w.top + w.height], outline="red", width=2)
+    return image
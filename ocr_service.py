@@ -0,0 +1,147 @@
+"""Asynchronous HTTP API for OCR + spell checking.
+
+Same results as streamlit_app.py, for programmatic clients:
+
+    POST /ocr        image upload -> JSON with text, word boxes and verdicts
+    POST /annotate   image upload -> annotated PNG (misspellings outlined in red)
+    GET  /health     pool and queue status
+
+The image is sent either as the raw request body or as the "image" field of a
+multipart form. OCR runs in a bounded process pool; once `workers + queue_size`
+requests are in flight, new ones get 429 with a Retry-After header instead of
+piling up in memory.
+
+    python ocr_service.py --port 8080 --workers 4 --queue-size 8
+
+Defaults come from the [service] section of ocr_config.ini.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from aiohttp import web
+from PIL import Image, UnidentifiedImageError
+
+import ocr_config
+import ocr_pipeline
+import spell_backends
+
+# Per worker process: the spelling backend is built once, not per request
+_speller = None
+
+
+def _init_worker():
+    global _speller
+    _speller = spell_backends.get_backend(default="textblob")
+
+
+def _check_upload(data):
+    image = Image.open(io.BytesIO(data)).convert("RGB")
+    return image, ocr_pipeline.check_page(image, _speller)
+
+
+def ocr_json(data):
+    _, checked = _check_upload(data)
+    result = {
+        "text": " ".join(w.text for w in checked),
+        "misspelled_count": sum(w.misspelled for w in checked),
+        "words": [w._asdict() for w in checked],
+    }
+    return json.dumps(result).encode("utf-8")
+
+
+def annotated_png(data):
+    image, checked = _check_upload(data)
+    buffered = io.BytesIO()
+    ocr_pipeline.annotate(image, checked).save(buffered, format="PNG")
+    return len(checked), sum(w.misspelled for w in checked), buffered.getvalue()
+
+
+class OCRService:
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.max_in_flight = workers + queue_size
+        self.in_flight = 0
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    async def read_image(self, request):
+        if request.content_type.startswith("multipart/"):
+            reader = await request.multipart()
+            async for part in reader:
+                if part.name == "image":
+                    return await part.read()
+            raise web.HTTPBadRequest(text="multipart upload has no 'image' field")
+        data = await request.read()
+        if not data:
+            raise web.HTTPBadRequest(text="empty request body")
+        return data
+
+    async def run(self, request, job):
+        # Reject before reading the body so a full server does no work for the request
+        if self.in_flight >= self.max_in_flight:
+            raise web.HTTPTooManyRequests(text="OCR queue is full, retry later", headers={"Retry-After": "1"})
+        self.in_flight += 1
+        try:
+            data = await self.read_image(request)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, job, data)
+        except UnidentifiedImageError:
+            raise web.HTTPUnsupportedMediaType(text="upload is not a readable image")
+        finally:
+            self.in_flight -= 1
+
+    async def handle_ocr(self, request):
+        body = await self.run(request, ocr_json)
+        return web.Response(body=body, content_type="application/json")
+
+    async def handle_annotate(self, request):
+        word_count, misspelled_count, png = await self.run(request, annotated_png)
+        return web.Response(body=png, content_type="image/png", headers={
+            "X-Word-Count": str(word_count),
+            "X-Misspelled-Count": str(misspelled_count),
+        })
+
+    async def handle_health(self, request):
+        return web.json_response({
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+        })
+
+    async def on_cleanup(self, app):
+        self.pool.shutdown(cancel_futures=True)
+
+
+def make_app(workers, queue_size, max_upload_mb):
+    service = OCRService(workers, queue_size)
+    app = web.Application(client_max_size=int(max_upload_mb * 1024 * 1024))
+    app.add_routes([
+        web.post("/ocr", service.handle_ocr),
+        web.post("/annotate", service.handle_annotate),
+        web.get("/health", service.handle_health),
+    ])
+    app.on_cleanup.append(service.on_cleanup)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR spell check HTTP service")
+    parser.add_argument("--host", default=ocr_config.get("service", "host", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=ocr_config.get_int("service", "port", 8080))
+    parser.add_argument("--workers", type=int,
+                        default=ocr_config.get_int("service", "workers", os.cpu_count() or 1))
+    parser.add_argument("--queue-size", type=int, default=ocr_config.get_int("service", "queue_size", 8),
+                        help="requests allowed to wait for a worker before returning 429")
+    parser.add_argument("--max-upload-mb", type=float,
+                        default=ocr_config.get_float("service", "max_upload_mb", 20))
+    args = parser.parse_args()
+
+    app = make_app(args.workers, args.queue_size, args.max_upload_mb)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
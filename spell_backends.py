@@ -0,0 +1,153 @@
+"""Interchangeable spell-checking engines behind one batch interface.
+
+Every backend implements `check_many(words)` and returns one `Verdict` per
+input word, in order. Leading and trailing punctuation is stripped before a word
+is checked, so the OCR token "hello," gets the same verdict from every engine.
+
+Front-ends pick their engine with `get_backend()`: the backend named in config
+([spelling] backend / $OCR_SPELLING_BACKEND), otherwise the front-end's own
+default. Switching engines, e.g. to "compact" for a compiled spelling.dict,
+always takes an explicit config choice.
+"""
+import string
+from collections import namedtuple
+
+import ocr_config
+import spelldict
+
+Verdict = namedtuple("Verdict", ["word", "misspelled", "suggestion"])
+
+
+PUNCTUATION = string.punctuation + "“”‘’«»…–—"
+
+
+def should_check(word):
+    # Numbers and single characters are never flagged
+    return not (word.isdigit() or len(word) < 2)
+
+
+def split_punctuation(word):
+    # "(hello," -> ("(", "hello", ",")
+    lead = len(word) - len(word.lstrip(PUNCTUATION))
+    core = word[lead:].rstrip(PUNCTUATION)
+    return word[:lead], core, word[lead + len(core):]
+
+
+class SpellBackend:
+    name = None
+
+    def check_many(self, words, suggest=False):
+        # Each distinct word is checked once however often it appears on the page
+        parts = [split_punctuation(w) for w in words]
+        unique = list(dict.fromkeys(core for _, core, _ in parts if should_check(core)))
+        results = self._check_unique(unique, suggest) if unique else {}
+        verdicts = []
+        for word, (lead, core, trail) in zip(words, parts):
+            misspelled, suggestion = results.get(core, (False, None))
+            if suggestion:
+                suggestion = lead + suggestion + trail
+            verdicts.append(Verdict(word, misspelled, suggestion))
+        return verdicts
+
+    def check(self, word, suggest=False):
+        return self.check_many([word], suggest)[0]
+
+    def _check_unique(self, words, suggest):
+        # Return {word: (misspelled, suggestion or None)} for distinct words
+        raise NotImplementedError
+
+
+class TextBlobBackend(SpellBackend):
+    name = "textblob"
+    cache_size = 50000
+
+    def __init__(self):
+        from textblob import TextBlob
+        self._textblob = TextBlob
+        self._cache = {}
+
+    def _check_unique(self, words, suggest):
+        # TextBlob has no batch API, so remember corrections across pages instead
+        results = {}
+        for word in words:
+            corrected = self._cache.get(word)
+            if corrected is None:
+                if len(self._cache) >= self.cache_size:
+                    self._cache.clear()
+                corrected = str(self._textblob(word).correct())
+                self._cache[word] = corrected
+            misspelled = corrected.lower() != word.lower()
+            results[word] = (misspelled, corrected if misspelled else None)
+        return results
+
+
+class PySpellCheckerBackend(SpellBackend):
+    name = "pyspellchecker"
+
+    def __init__(self):
+        from spellchecker import SpellChecker
+        self.spell = SpellChecker()
+
+    def _check_unique(self, words, suggest):
+        unknown = self.spell.unknown(words)
+        results = {}
+        for word in words:
+            misspelled = word.lower() in unknown
+            suggestion = self.spell.correction(word) if misspelled and suggest else None
+            results[word] = (misspelled, suggestion)
+        return results
+
+
+class CompactBackend(SpellBackend):
+    name = "compact"
+
+    def __init__(self, path=None):
+        self.dictionary = spelldict.load(path)
+
+    def _check_unique(self, words, suggest):
+        results = {}
+        for word in words:
+            misspelled = word not in self.dictionary
+            suggestion = None
+            if misspelled and suggest:
+                corrected = self.dictionary.correct(word)
+                suggestion = corrected if corrected.lower() != word.lower() else None
+            results[word] = (misspelled, suggestion)
+        return results
+
+
+class CachedBackend(SpellBackend):
+    # Wraps another backend and remembers its verdicts, for callers such as live
+    # OCR that see the same tokens over and over
+    cache_size = 50000
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = backend.name
+        self._cache = {}
+
+    def _is_cached(self, word, suggest):
+        if word not in self._cache:
+            return False
+        misspelled, suggestion = self._cache[word]
+        # A verdict cached without a suggestion is not enough when one is asked for
+        return not (suggest and misspelled and suggestion is None)
+
+    def _check_unique(self, words, suggest):
+        missing = [w for w in words if not self._is_cached(w, suggest)]
+        if len(self._cache) + len(missing) > self.cache_size:
+            self._cache.clear()
+            missing = words
+        if missing:
+            self._cache.update(self.backend._check_unique(missing, suggest))
+        return {w: self._cache[w] for w in words}
+
+
+BACKENDS = {backend.name: backend for backend in (TextBlobBackend, PySpellCheckerBackend, CompactBackend)}
+
+
+def get_backend(default="textblob"):
+    name = ocr_config.get("spelling", "backend") or default
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown spelling backend '{name}', expected one of: {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
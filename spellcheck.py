@@ -3,7 +3,9 @@ from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk, ImageDraw
 import pytesseract
 import numpy as np
-from textblob import TextBlob
+import exporters
+import ocr_pipeline
+import spell_backends
 
 # Set tesseract path (update this to your Tesseract installation path)
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
@@ -20,10 +22,14 @@ class OCRSpellCheckApp:
         self.original_image = None
         self.tk_image = None
         self.ocr_data = None
+        self.checked_words = []
 
         # Create widgets
         self.create_widgets()
 
+        # Initialize spell checker (engine chosen via ocr_config)
+        self.speller = spell_backends.get_backend(default="textblob")
+
     def create_widgets(self):
         # Top frame for buttons
         top_frame = tk.Frame(self.root)
@@ -56,6 +62,7 @@ class OCRSpellCheckApp:
         if file_path:
             self.image_path = file_path
             self.original_image = Image.open(file_path)
+            self.checked_words = []
             self.display_image(self.original_image)
             self.text_display.delete(1.0, tk.END)
 
@@ -73,27 +80,15 @@ class OCRSpellCheckApp:
         self.tk_image = ImageTk.PhotoImage(image)
         self.image_label.config(image=self.tk_image)
 
-    def is_misspelled(self, word):
-        # Skip numbers and very short words
-        if word.isdigit() or len(word) < 2:
-            return False
-
-        # Check spelling using TextBlob
-        tb = TextBlob(word)
-        corrected = tb.correct()
-        return str(corrected).lower() != word.lower()
-
     def process_image(self):
         if not self.image_path:
             messagebox.showerror("Error", "Please load an image first")
             return
 
         try:
-            # Perform OCR
+            # Perform OCR (full or adaptive, see ocr_pipeline)
             img = Image.open(self.image_path)
-            self.ocr_data = pytesseract.image_to_data(
-                img, output_type=pytesseract.Output.DICT
-            )
+            self.ocr_data = ocr_pipeline.image_to_data(img)
 
             # Get all words and their bounding boxes
             words = self.ocr_data['text']
@@ -111,9 +106,18 @@ class OCRSpellCheckApp:
             draw = ImageDraw.Draw(self.original_image)
             misspelled_words = []
 
-            for i in valid_indices:
+            # Check spelling of the whole page in one batch; numbers and very
+            # short words are never flagged
+            verdicts = self.speller.check_many([words[i] for i in valid_indices])
+            self.checked_words = [
+                ocr_pipeline.CheckedWord(*(self.ocr_data[key][i] for key in ocr_pipeline.DATA_KEYS),
+                                         verdict.misspelled, verdict.suggestion)
+                for i, verdict in zip(valid_indices, verdicts)
+            ]
+
+            for i, verdict in zip(valid_indices, verdicts):
                 word = words[i]
-                if self.is_misspelled(word):
+                if verdict.misspelled:
                     # This word is misspelled
                     misspelled_words.append(word)
 
@@ -157,9 +161,21 @@ class OCRSpellCheckApp:
 
         file_path = filedialog.asksaveasfilename(
             defaultextension=".png",
-            filetypes=[("PNG files", "*.png"), ("JPEG files", "*.jpg"), ("All files", "*.*")]
+            filetypes=[("PNG files", "*.png"), ("JPEG files", "*.jpg"), ("JSON Lines", "*.jsonl"),
+                       ("hOCR", "*.hocr"), ("ALTO XML", "*.xml"), ("All files", "*.*")]
         )
-        if file_path:
+        if not file_path:
+            return
+
+        if exporters.format_for_path(file_path):
+            # Word boxes, confidences and spelling flags instead of the bitmap
+            if not self.checked_words:
+                messagebox.showerror("Error", "Process the image before exporting OCR results")
+                return
+            with exporters.open_exporter(file_path) as exporter:
+                exporter.write_page(self.checked_words, self.original_image.size, source=self.image_path)
+            messagebox.showinfo("Success", "OCR results exported successfully")
+        else:
             self.original_image.save(file_path)
             messagebox.showinfo("Success", "Image saved successfully")
 
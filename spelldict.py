@@ -0,0 +1,241 @@
+"""Compact, memory-mapped spelling dictionary.
+
+`python spelldict.py spelling.dict --source textblob --words domain.txt` compiles
+word frequencies into a read-only file. At runtime `load()` maps that file
+instead of building a Python dict, so start-up is instant and processes forked
+from the same parent share the pages through the OS page cache.
+
+File layout (all integers little-endian uint32):
+
+    MAGIC | count | offsets[count + 1] | freqs[count] | utf-8 words, sorted
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import ocr_config
+
+MAGIC = b"OCRDICT1"
+HEADER = struct.Struct("<8sI")
+UINT32 = struct.Struct("<I")
+MAX_FREQ = 0xFFFFFFFF
+
+# Where the apps look for a compiled dictionary unless [spelling] dictionary in
+# ocr_config (or $OCR_SPELLING_DICTIONARY) says otherwise
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spelling.dict")
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+class CompactDictionary:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled spelling dictionary")
+        self._offsets_at = HEADER.size
+        self._freqs_at = self._offsets_at + (self.count + 1) * UINT32.size
+        self._words_at = self._freqs_at + self.count * UINT32.size
+
+        # Index the offset table as ints without unpacking on every probe. On
+        # little-endian machines this is a view of the mapped pages themselves
+        raw_offsets = memoryview(self._mm)[self._offsets_at:self._freqs_at]
+        if sys.byteorder == "little":
+            self._offsets = raw_offsets.cast("I")
+        else:
+            self._offsets = array("I", raw_offsets)
+            self._offsets.byteswap()
+            raw_offsets.release()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, word):
+        return self._find(word.lower().encode("utf-8")) >= 0
+
+    def close(self):
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._mm.close()
+
+    def _word(self, i):
+        # Copies just this word's bytes out of the mapping
+        return self._mm[self._words_at + self._offsets[i]:self._words_at + self._offsets[i + 1]]
+
+    def _search(self, key):
+        # Binary search over the mapped file: index of the first word >= key.
+        # Only the probed words are read, nothing is loaded up front
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, key):
+        i = self._search(key)
+        if i < self.count and self._word(i) == key:
+            return i
+        return -1
+
+    def prefix_length(self, word):
+        # Length of the longest prefix of word that some dictionary word starts
+        # with. The closest match in sorted order is next to the insertion point
+        key = word.encode("utf-8")
+        i = self._search(key)
+        best = 0
+        for j in (i - 1, i):
+            if 0 <= j < self.count:
+                other = self._word(j).decode("utf-8")
+                n = 0
+                while n < len(word) and n < len(other) and word[n] == other[n]:
+                    n += 1
+                best = max(best, n)
+        return best
+
+    def frequency(self, word):
+        i = self._find(word.lower().encode("utf-8"))
+        if i < 0:
+            return 0
+        return UINT32.unpack_from(self._mm, self._freqs_at + i * UINT32.size)[0]
+
+    def known(self, words):
+        return {w for w in words if w in self}
+
+    def edits1(self, word):
+        # An edit at position i keeps word[:i], so positions past the longest
+        # prefix any dictionary word starts with cannot produce a known word.
+        # Only exact for edits that are looked up directly: an intermediate
+        # string needs every position, as a second edit may repair its prefix
+        return edits1(word, self.prefix_length(word))
+
+    def candidates(self, word):
+        # Same search order as TextBlob / pyspellchecker: the word itself, then
+        # one edit away, then two. Distance two is only tried when one finds nothing.
+        word = word.lower()
+        if word in self:
+            return {word}
+        first = edits1(word)
+        found = self.known(first)
+        if found:
+            return found
+        second = set()
+        for e1 in first:
+            second |= self.edits1(e1)
+        return self.known(second)
+
+    def correct(self, word):
+        found = self.candidates(word)
+        if not found:
+            return word
+        best = max(found, key=lambda w: (self.frequency(w), w))
+        return best.title() if word.istitle() else best
+
+
+def edits1(word, max_split=None):
+    # All strings one delete, transpose, replace or insert away from word, with
+    # the edit at positions up to max_split
+    last = len(word) if max_split is None else min(max_split, len(word))
+    splits = [(word[:i], word[i:]) for i in range(last + 1)]
+    deletes = [a + b[1:] for a, b in splits if b]
+    transposes = [a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1]
+    replaces = [a + c + b[1:] for a, b in splits if b for c in ALPHABET]
+    inserts = [a + c + b for a, b in splits for c in ALPHABET]
+    return set(deletes + transposes + replaces + inserts)
+
+
+_loaded = {}
+
+
+def dictionary_path():
+    return ocr_config.get("spelling", "dictionary", DEFAULT_PATH)
+
+
+def load(path=None):
+    # One mapping per path per process. Loading before forking workers lets
+    # them inherit the mapping instead of opening their own.
+    path = path or dictionary_path()
+    if path not in _loaded:
+        _loaded[path] = CompactDictionary(path)
+    return _loaded[path]
+
+
+def read_word_list(path, default_freq=1):
+    # One word per line, optionally followed by a count: "word" or "word 123"
+    counts = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            freq = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else default_freq
+            counts[parts[0]] = freq
+    return counts
+
+
+def source_frequencies(name):
+    if name == "textblob":
+        from textblob.en import spelling
+        return dict(spelling.items())
+    if name == "pyspellchecker":
+        from spellchecker import SpellChecker
+        return dict(SpellChecker().word_frequency.dictionary)
+    raise ValueError(f"Unknown dictionary source: {name}")
+
+
+def build(path, frequency_maps):
+    merged = {}
+    for counts in frequency_maps:
+        for word, freq in counts.items():
+            word = word.strip().lower()
+            if not word:
+                continue
+            merged[word] = min(max(merged.get(word, 0), int(freq)), MAX_FREQ)
+
+    # Sort by encoded bytes so the runtime search can compare raw bytes
+    entries = sorted((w.encode("utf-8"), f) for w, f in merged.items())
+
+    offsets = [0]
+    for word, _ in entries:
+        offsets.append(offsets[-1] + len(word))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(struct.pack(f"<{len(entries)}I", *(freq for _, freq in entries)))
+        for word, _ in entries:
+            f.write(word)
+    # Replace atomically so running apps never map a half-written file
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a memory-mapped spelling dictionary")
+    parser.add_argument("output", nargs="?", default=dictionary_path(),
+                        help="dictionary file to write (default: [spelling] dictionary from ocr_config)")
+    parser.add_argument("--source", action="append", choices=["textblob", "pyspellchecker"],
+                        help="bundled word-frequency list to include (repeatable)")
+    parser.add_argument("--words", action="append", default=[],
+                        help="user or domain word list, one word per line (repeatable)")
+    args = parser.parse_args()
+
+    sources = args.source or ["textblob"]
+    frequency_maps = [source_frequencies(name) for name in sources]
+    frequency_maps += [read_word_list(path) for path in args.words]
+
+    count = build(args.output, frequency_maps)
+    print(f"Wrote {count} words to {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
 import streamlit as st
 from PIL import Image, ImageDraw
-import pytesseract
-from textblob import TextBlob
+import ocr_pipeline
+import spell_backends
 import io
 import base64
 
 # Optional: Tesseract path (set this locally if needed)
-# pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+# import pytesseract; pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
 st.set_page_config(page_title="OCR Spell Check", layout="wide")
 st.title("🖼️ OCR Spell Check Web App")
@@ -16,11 +16,10 @@ st.write("Upload an image with text. This app will extract the text using OCR an
 # File uploader
 uploaded_file = st.file_uploader("Choose an image file", type=["png", "jpg", "jpeg", "bmp", "tiff"])
 
-def is_misspelled(word):
-    if word.isdigit() or len(word) < 2:
-        return False
-    blob = TextBlob(word)
-    return blob.correct().lower() != word.lower()
+@st.cache_resource
+def get_speller():
+    # Built once per server process instead of on every script rerun
+    return spell_backends.get_backend(default="textblob")
 
 if uploaded_file:
     image = Image.open(uploaded_file).convert("RGB")
@@ -28,7 +27,7 @@ if uploaded_file:
 
     if st.button("🔍 Process Image"):
         with st.spinner("Processing..."):
-            ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+            ocr_data = ocr_pipeline.image_to_data(image)
 
             words = ocr_data['text']
             confs = ocr_data['conf']
@@ -41,17 +40,23 @@ if uploaded_file:
             result_text = ""
             misspelled_count = 0
 
+            valid_indices = []
             for i, word in enumerate(words):
-                conf = int(confs[i]) if confs[i].isdigit() else 0
+                conf = ocr_pipeline.parse_conf(confs[i])
                 if word.strip() and conf > 60:
-                    if is_misspelled(word):
-                        misspelled_count += 1
-                        x, y = lefts[i], tops[i]
-                        w, h = widths[i], heights[i]
-                        draw.rectangle([x, y, x + w, y + h], outline="red", width=2)
-                        result_text += f":red[{word}] "
-                    else:
-                        result_text += word + " "
+                    valid_indices.append(i)
+            verdicts = get_speller().check_many([words[i] for i in valid_indices])
+
+            for i, verdict in zip(valid_indices, verdicts):
+                word = words[i]
+                if verdict.misspelled:
+                    misspelled_count += 1
+                    x, y = lefts[i], tops[i]
+                    w, h = widths[i], heights[i]
+                    draw.rectangle([x, y, x + w, y + h], outline="red", width=2)
+                    result_text += f":red[{word}] "
+                else:
+                    result_text += word + " "
 
         st.subheader("🔤 Extracted Text")
         st.markdown(result_text)
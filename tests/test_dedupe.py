@@ -0,0 +1,54 @@
+import os
+import sys
+
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dedupe  # noqa: E402
+
+MAX_DISTANCE = 20
+MAX_CHANGED_PERCENT = 5.0
+
+
+def form(name):
+    # A4 at 300 dpi: a printed template with one filled-in field
+    page = Image.new("L", (2480, 3508), 255)
+    draw = ImageDraw.Draw(page)
+    font = ImageFont.load_default(size=40)
+    y = 200
+    for label in ["Application form", "Name:", "Address:", "City:", "Date of birth:", "Signature:"] * 3:
+        draw.text((200, y), label, fill=0, font=font)
+        draw.line((700, y + 45, 2200, y + 45), fill=0, width=3)
+        y += 150
+    draw.text((720, 350), name, fill=0, font=font)
+    return page
+
+
+def test_same_template_forms_are_not_duplicates(tmp_path):
+    paths = [str(tmp_path / "alice.png"), str(tmp_path / "bob.png"), str(tmp_path / "alicf.png")]
+    form("Alice Johnson").save(paths[0])
+    form("Bob Smith").save(paths[1])
+    form("Alicf Johnson").save(paths[2])
+
+    # The hashes match, so it is the pixel comparison that has to tell them apart
+    hashes = [dedupe.fingerprint(p)[0] for p in paths]
+    assert all(dedupe.hamming(hashes[0], h) <= MAX_DISTANCE for h in hashes[1:])
+
+    clusters = dedupe.cluster(paths, MAX_DISTANCE, MAX_CHANGED_PERCENT)
+    assert clusters == {0: [0], 1: [1], 2: [2]}
+
+
+def test_resaved_page_is_a_duplicate(tmp_path):
+    paths = [str(tmp_path / "alice.png"), str(tmp_path / "bob.png"), str(tmp_path / "alice.jpg")]
+    alice = form("Alice Johnson")
+    alice.save(paths[0])
+    form("Bob Smith").save(paths[1])
+    alice.point(lambda v: min(255, v + 20)).save(paths[2], quality=60)
+
+    clusters = dedupe.cluster(paths, MAX_DISTANCE, MAX_CHANGED_PERCENT)
+    assert clusters == {0: [0, 2], 1: [1]}
+
+    # Only the most recent representative is kept, so alice.jpg no longer sees alice.png
+    clusters = dedupe.cluster(paths, MAX_DISTANCE, MAX_CHANGED_PERCENT, max_representatives=1)
+    assert clusters == {0: [0], 1: [1], 2: [2]}
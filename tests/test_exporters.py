@@ -0,0 +1,22 @@
+import os
+import re
+import sys
+from urllib.parse import unquote
+from xml.etree import ElementTree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import exporters  # noqa: E402
+
+
+def test_hocr_image_property_survives_quotes_and_semicolons(tmp_path):
+    output = str(tmp_path / "out.hocr")
+    source = 'scans/invoice "final"; v2 100%.png'
+    with exporters.open_exporter(output) as exporter:
+        exporter.write_page([], (100, 200), source=source)
+
+    page = ElementTree.parse(output).getroot().find(".//{http://www.w3.org/1999/xhtml}div")
+    properties = [p.strip() for p in page.get("title").split(";")]
+    assert properties[1:] == ["bbox 0 0 100 200", "ppageno 0"]
+    match = re.fullmatch(r'image "([^"]*)"', properties[0])
+    assert match and unquote(match.group(1)) == source
@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spelldict  # noqa: E402
+
+
+def unpruned_candidates(words, word):
+    # The search without prefix pruning, as TextBlob and pyspellchecker do it,
+    # over a plain set of the dictionary's words
+    word = word.lower()
+    if word in words:
+        return {word}
+    first = spelldict.edits1(word)
+    found = first & words
+    if found:
+        return found
+    return {e2 for e1 in first for e2 in spelldict.edits1(e1)} & words
+
+
+SMALL_WORDS = {"form", "house", "receive"}
+
+
+@pytest.fixture
+def small_dict(tmp_path):
+    path = str(tmp_path / "small.dict")
+    spelldict.build(path, [dict.fromkeys(SMALL_WORDS, 1)])
+    dictionary = spelldict.CompactDictionary(path)
+    yield dictionary
+    dictionary.close()
+
+
+@pytest.mark.parametrize("word, expected", [
+    ("hosxue", {"house"}),
+    ("fomxr", {"form"}),
+    ("recevxie", {"receive"}),
+    ("hous", {"house"}),
+    ("recieve", {"receive"}),
+    ("form", {"form"}),
+    ("xyzzy", set()),
+])
+def test_candidates_keep_distance_two_matches(small_dict, word, expected):
+    assert small_dict.candidates(word) == expected
+    assert small_dict.candidates(word) == unpruned_candidates(SMALL_WORDS, word)
+
+
+def test_candidates_match_unpruned_search(tmp_path):
+    rnd = random.Random(27)
+    words = {"".join(rnd.choice("abcdeiorst") for _ in range(rnd.randint(3, 8))) for _ in range(300)}
+    path = str(tmp_path / "random.dict")
+    spelldict.build(path, [dict.fromkeys(words, 1)])
+    dictionary = spelldict.CompactDictionary(path)
+    try:
+        for word in sorted(words)[:15]:
+            # Two random edits anywhere in the word, including its first letters
+            typo = rnd.choice(sorted(spelldict.edits1(rnd.choice(sorted(spelldict.edits1(word))))))
+            assert dictionary.candidates(typo) == unpruned_candidates(words, typo), typo
+    finally:
+        dictionary.close()